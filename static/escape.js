@@ -0,0 +1,15 @@
+// Shared by dashboard.js and playlistutil.js, loaded before either of them
+
+// Escape text from the API before it goes into innerHTML
+function esc(value) {
+  return String(value ?? "").replace(
+    /[&<>"']/g,
+    (c) =>
+      ({ "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;" }[c])
+  );
+}
+
+// Text passed as a '...' string argument inside an onclick="..." attribute
+function jsArg(value) {
+  return esc(String(value ?? "").replace(/\\/g, "\\\\").replace(/'/g, "\\'"));
+}
@@ -51,27 +51,27 @@ function loadMyPlaylists() {
       const playlistSelect = document.getElementById("playlistSelect");
       playlistSelect.style.display = "block";
 
-      let html =
-        '<h3 style="padding: 10px; color: #1DB954;">Select a Playlist:</h3>';
-      data.playlists.forEach((playlist) => {
-        html += `
+      const items = data.playlists.map(
+        (playlist) => `
                             <div class="playlist-item" onclick="selectPlaylist('${
                               playlist.id
-                            }', '${playlist.name.replace(/'/g, "\\'")}')">
+                            }', '${jsArg(playlist.name)}')">
                                 <div class="playlist-info">
                                     <div class="playlist-name">${
-                                      playlist.name
+                                      esc(playlist.name)
                                     }</div>
                                     <div class="playlist-meta">${
                                       playlist.tracks
-                                    } tracks • ${playlist.owner}</div>
+                                    } tracks • ${esc(playlist.owner)}</div>
                                     
                                 </div>
                                 <div>▶</div>
                             </div>
-                        `;
-      });
-      playlistSelect.innerHTML = html;
+                        `
+      );
+      playlistSelect.innerHTML =
+        '<h3 style="padding: 10px; color: #1DB954;">Select a Playlist:</h3>' +
+        items.join("");
     })
     .catch((error) => {
       document.getElementById("loading").style.display = "none";
@@ -142,12 +142,11 @@ function checkCopyright() {
 }
 
 function renderTrackList(trackList) {
-  let html = "";
-  trackList.forEach((track) => {
-    html += `
+  const items = trackList.map(
+    (track) => `
       <div class="track" onclick="openTrackDetails('${track.id}')">
-          <div class="track-name">${track.name}</div>
-          <div class="track-artist">${track.artist}</div>
+          <div class="track-name">${esc(track.name)}</div>
+          <div class="track-artist">${esc(track.artist)}</div>
           <div style="display:flex; gap:10px; align-items:center; margin-top:8px; flex-wrap: wrap;">
               <span class="license-badge ${
                 track.license?.status === "unsure"
@@ -172,16 +171,16 @@ function renderTrackList(trackList) {
               ${
                 track.copyrights.length > 0
                   ? track.copyrights
-                      .map((c) => `${c.type}: ${c.text}`)
+                      .map((c) => `${esc(c.type)}: ${esc(c.text)}`)
                       .join("<br>")
                   : " No copyright information found"
               }
           </div>
       </div>
-    `;
-  });
+    `
+  );
 
-  document.getElementById("trackList").innerHTML = html;
+  document.getElementById("trackList").innerHTML = items.join("");
 }
 
 // Initialize on load
@@ -227,9 +226,9 @@ function openTrackDetails(trackId) {
                             </div>
                         <div class="details-grid">
                             <div class="detail-box">
-                                <strong>Album</strong><br>${data.album.name} (${
+                                <strong>Album</strong><br>${esc(data.album.name)} (${
         data.album.release_date
-      })<br>Label: ${data.album.label || "—"}
+      })<br>Label: ${esc(data.album.label || "—")}
                             </div>
                             <div class="detail-box">
                                 <strong>Popularity</strong><br>${
@@ -254,7 +253,7 @@ function openTrackDetails(trackId) {
                                 <strong>Copyrights</strong><br>
                                 ${
                                   (data.album.copyrights || [])
-                                    .map((c) => `${c.type}: ${c.text}`)
+                                    .map((c) => `${esc(c.type)}: ${esc(c.text)}`)
                                     .join("<br>") || "None"
                                 }
                             </div>
@@ -288,11 +287,14 @@ function addTrack(trackId) {
     .then((data) => {
       const playlists = data.playlists;
 
-      let optionsHtml = '<option value="">Choose a playlist</option>';
-
-      playlists.forEach((playlist) => {
-        optionsHtml += `<option value="${playlist.id}">${playlist.name}</option>`;
-      });
+      const optionsHtml =
+        '<option value="">Choose a playlist</option>' +
+        playlists
+          .map(
+            (playlist) =>
+              `<option value="${esc(playlist.id)}">${esc(playlist.name)}</option>`
+          )
+          .join("");
 
       body.innerHTML = `
         <select id="playlistDropdown" >
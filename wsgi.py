@@ -0,0 +1,6 @@
+# gevent entry point: sockets have to be patched before requests/urllib3 are imported,
+# so this runs before app.py is loaded (also when gunicorn is started with --preload)
+from gevent import monkey
+monkey.patch_all()
+
+from app import app  # noqa: E402